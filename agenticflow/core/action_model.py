@@ -4,9 +4,14 @@ This module defines the ActionModel class which is responsible for executing wor
 using strategic planning methods.
 """
 
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, FrozenSet, TYPE_CHECKING
 from .workflow import Workflow
 from .context import Context
+from ..models.cache import flush_caches
+
+# The strategy registry imports the strategies, which import this module
+if TYPE_CHECKING:
+    from ..strategies.registry import StrategyRegistry
 
 
 class ActionModel:
@@ -16,16 +21,20 @@ class ActionModel:
     the optimal response using strategic planning methods.
     """
     
-    def __init__(self):
-        """Initialize the action model."""
-        self.strategies = {}
+    def __init__(self, registry: Optional["StrategyRegistry"] = None):
+        """Initialize the action model with the strategies of `registry`, if given."""
+        self.strategies = dict(registry.strategies) if registry is not None else {}
         
     def register_strategy(self, name: str, strategy_func: Callable) -> None:
         """Register a strategy for workflow execution."""
         self.strategies[name] = strategy_func
         
-    def execute(self, workflow: Workflow, strategy: str = "dfs", initial_data: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute a workflow using the specified strategy."""
+    def execute(self, workflow: Workflow, strategy: str = "dfs", initial_data: Dict[str, Any] = None,
+                **options: Any) -> Dict[str, Any]:
+        """Execute a workflow using the specified strategy.
+        
+        Extra keyword options are passed on to the strategy, e.g. `concurrent=True` for BFS.
+        """
         if strategy not in self.strategies:
             raise ValueError(f"Strategy '{strategy}' not registered")
         
@@ -33,17 +42,56 @@ class ActionModel:
         data = initial_data or {}
         
         # Execute the workflow using the selected strategy
-        return self.strategies[strategy](workflow, data)
+        return self.strategies[strategy](workflow, data, **options)
     
     def execute_context(self, context: Context, data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single context with the given data."""
-        # Prepare inputs for the context
-        inputs = {k: data.get(k) for k in context.inputs.keys() if k in data}
-        
-        # Execute the context
-        result = context.run(**inputs)
-        
-        # Update the data with the context outputs
-        data.update(result)
-        
-        return data
+        return run_context(context, data)
+    
+    async def execute_context_async(self, context: Context, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a single context with the given data without blocking the event loop."""
+        return await run_context_async(context, data)
+
+
+def run_context(context: Context, data: Dict[str, Any], input_keys: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+    """Execute a single context with the given data.
+    
+    The context inputs are filled from `data` and the context outputs are merged
+    back into it. Strategies call this directly on every node they visit, passing
+    the input keys precomputed by the workflow compiler.
+    """
+    # Prepare inputs for the context
+    if input_keys is None:
+        input_keys = frozenset(context.inputs)
+    inputs = {k: data[k] for k in input_keys & data.keys()}
+    
+    # Execute the context
+    result = context.run(**inputs)
+    
+    # Update the data with the context outputs
+    data.update(result)
+    
+    if context.cache_policy == "flush":
+        flush_caches(context.response_caches)
+    
+    return data
+
+
+async def run_context_async(context: Context, data: Dict[str, Any],
+                            input_keys: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+    """Asynchronous counterpart of `run_context`."""
+    # Prepare inputs for the context
+    if input_keys is None:
+        input_keys = frozenset(context.inputs)
+    inputs = {k: data[k] for k in input_keys & data.keys()}
+    
+    # Execute the context
+    result = await context.run_async(**inputs)
+    
+    # Update the data with the context outputs
+    data.update(result)
+    
+    if context.cache_policy == "flush":
+        flush_caches(context.response_caches)
+    
+    return data
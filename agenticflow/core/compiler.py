@@ -0,0 +1,179 @@
+"""Compiler module for AgenticFlow framework.
+
+This module defines the WorkflowCompiler class which turns a Workflow into a static
+ExecutionGraph. The execution graph assigns every context an integer id and stores the
+workflow structure as plain adjacency lists, so strategies can traverse it with simple
+list indexing instead of walking the networkx graph on every step.
+
+For DAG workflows that are executed repeatedly, the compiler can also specialize the
+workflow into generated straight-line Python code.
+"""
+
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Tuple, Optional, Callable, Any
+from .workflow import Workflow
+from .context import Context
+from ..models.cache import flush_caches
+
+
+@dataclass(frozen=True)
+class ExecutionGraph:
+    """A compiled, read-only view of a workflow.
+    
+    Contexts are referred to by their integer id, which indexes into `node_map`,
+    `connection_map` and `reverse_connection_map`. The successors are also stored in
+    CSR form for numeric kernels: the successors of context `i` are
+    `successor_flat[successor_offsets[i]:successor_offsets[i + 1]]`.
+    
+    `input_keys[i]` is the set of input names of context `i`, captured at compile time.
+    `topological_order` is None if the workflow contains a cycle. Bit `j` of
+    `predecessor_masks[i]` is set if context `j` is a predecessor of context `i`, so
+    context `i` is ready once `done_mask & predecessor_masks[i] == predecessor_masks[i]`.
+    """
+    
+    __slots__ = ("node_map", "connection_map", "reverse_connection_map", "trigger_ids",
+                 "successor_flat", "successor_offsets", "input_keys", "topological_order",
+                 "predecessor_masks")
+    
+    node_map: List[Context]
+    connection_map: List[Tuple[int, ...]]
+    reverse_connection_map: List[Tuple[int, ...]]
+    trigger_ids: List[int]
+    successor_flat: List[int]
+    successor_offsets: List[int]
+    input_keys: List[FrozenSet[str]]
+    topological_order: Optional[Tuple[int, ...]]
+    predecessor_masks: Tuple[int, ...]
+    
+    def __len__(self) -> int:
+        return len(self.node_map)
+
+
+class WorkflowCompiler:
+    """Compiler that turns workflows into execution graphs."""
+    
+    # Execution graphs and specialized run functions, with the workflow version they were built for
+    _compiled: "weakref.WeakKeyDictionary[Workflow, Tuple[int, ExecutionGraph]]" = weakref.WeakKeyDictionary()
+    _specialized: "weakref.WeakKeyDictionary[Workflow, Tuple[ExecutionGraph, Callable]]" = weakref.WeakKeyDictionary()
+    
+    @classmethod
+    def compile(cls, workflow: Workflow) -> ExecutionGraph:
+        """Compile a workflow into an execution graph.
+        
+        The execution graph is cached per workflow and rebuilt after the workflow
+        changes or the input names of a context change, so repeated executions of the
+        same workflow share it.
+        """
+        cached = cls._compiled.get(workflow)
+        if cached is not None and cached[0] == workflow._version and _inputs_unchanged(cached[1]):
+            return cached[1]
+        
+        eg = _build_execution_graph(workflow)
+        cls._compiled[workflow] = (workflow._version, eg)
+        return eg
+    
+    @classmethod
+    def specialize(cls, workflow: Workflow) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Generate a straight-line function that executes a DAG workflow.
+        
+        The generated function runs every context once in topological order, updating
+        and returning the given data, with no visited checks or strategy dispatch. Cache
+        policies are read as each context runs, like `run_context` does. The function is
+        cached per workflow and regenerated whenever the execution graph is rebuilt,
+        which also happens after the context input names change.
+        """
+        eg = cls.compile(workflow)
+        cached = cls._specialized.get(workflow)
+        if cached is not None and cached[0] is eg:
+            return cached[1]
+        
+        if eg.topological_order is None:
+            raise ValueError(f"Workflow {workflow.name} contains a cycle and cannot be specialized")
+        
+        params = ["data", "_flush=_flush"]
+        body = []
+        for i in eg.topological_order:
+            params.append(f"_c{i}=_contexts[{i}]")
+            if eg.input_keys[i]:
+                params.append(f"_k{i}=_input_keys[{i}]")
+                body.append(f"    data.update(_c{i}.run(**{{k: data[k] for k in _k{i} & data.keys()}}))")
+            else:
+                body.append(f"    data.update(_c{i}.run())")
+            body.append(f"    if _c{i}.cache_policy == 'flush':")
+            body.append(f"        _flush(_c{i}.response_caches)")
+        body.append("    return data")
+        source = f"def _run({', '.join(params)}):\n" + "\n".join(body) + "\n"
+        
+        namespace = {"_contexts": eg.node_map, "_input_keys": eg.input_keys, "_flush": flush_caches}
+        exec(compile(source, f"<workflow {workflow.name}>", "exec"), namespace)
+        run = namespace["_run"]
+        
+        cls._specialized[workflow] = (eg, run)
+        return run
+
+
+def _build_execution_graph(workflow: Workflow) -> ExecutionGraph:
+    """Build the execution graph of a workflow."""
+    adj = workflow._succ
+    index = {ctx_id: i for i, ctx_id in enumerate(adj)}
+    node_map = [workflow.contexts[ctx_id] for ctx_id in adj]
+    
+    # Walk the adjacency once, filling both directions
+    successors: List[List[int]] = [[] for _ in node_map]
+    predecessors: List[List[int]] = [[] for _ in node_map]
+    for ctx_id, succ_ids in adj.items():
+        i = index[ctx_id]
+        for succ_id in succ_ids:
+            j = index[succ_id]
+            successors[i].append(j)
+            predecessors[j].append(i)
+    
+    # Freeze the lists so strategies can index them without copying
+    connection_map = [tuple(ids) for ids in successors]
+    reverse_connection_map = [tuple(ids) for ids in predecessors]
+    
+    # Flatten the successors into CSR lists
+    successor_flat = [j for ids in connection_map for j in ids]
+    successor_offsets = [0]
+    for ids in connection_map:
+        successor_offsets.append(successor_offsets[-1] + len(ids))
+    
+    trigger_ids = [index[ctx_id] for ctx_id in workflow._starts]
+    
+    return ExecutionGraph(
+        node_map=node_map,
+        connection_map=connection_map,
+        reverse_connection_map=reverse_connection_map,
+        trigger_ids=trigger_ids,
+        successor_flat=successor_flat,
+        successor_offsets=successor_offsets,
+        input_keys=[frozenset(context.inputs) for context in node_map],
+        topological_order=_topological_order(connection_map, reverse_connection_map),
+        predecessor_masks=tuple(sum(1 << j for j in preds) for preds in reverse_connection_map),
+    )
+
+
+def _inputs_unchanged(eg: ExecutionGraph) -> bool:
+    """Check that the input names of every context still match the compiled ones."""
+    return all(context.inputs.keys() == keys for context, keys in zip(eg.node_map, eg.input_keys))
+
+
+def _topological_order(connection_map: List[Tuple[int, ...]],
+                       reverse_connection_map: List[Tuple[int, ...]]) -> Optional[Tuple[int, ...]]:
+    """Order the contexts with Kahn's algorithm, or return None if there is a cycle."""
+    in_degree = [len(preds) for preds in reverse_connection_map]
+    queue = deque(i for i, degree in enumerate(in_degree) if degree == 0)
+    order = []
+    while queue:
+        i = queue.popleft()
+        order.append(i)
+        for j in connection_map[i]:
+            in_degree[j] -= 1
+            if in_degree[j] == 0:
+                queue.append(j)
+    
+    if len(order) < len(connection_map):
+        return None
+    return tuple(order)
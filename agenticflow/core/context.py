@@ -4,11 +4,18 @@ This module defines the Context class which represents a step in a workflow.
 Each context has inputs, prompts, tools, and outputs, similar to an object in OOP.
 """
 
-from typing import Dict, List, Any, Callable, Optional
-from pydantic import BaseModel, Field
+import asyncio
+import inspect
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Any, Awaitable, Callable, Optional, Literal
 
+# Event loop of each thread, for running coroutine run functions from synchronous code
+_thread_loops = threading.local()
 
-class Context(BaseModel):
+
+@dataclass(slots=True)
+class Context:
     """A context or step in a workflow.
     
     Each context behaves like an object in OOP, with defined inputs, prompts, tools, and outputs.
@@ -17,38 +24,143 @@ class Context(BaseModel):
     id: str
     name: str
     description: str = ""
-    inputs: Dict[str, Any] = Field(default_factory=dict)
-    outputs: Dict[str, Any] = Field(default_factory=dict)
-    tools: List[Any] = Field(default_factory=list)
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    tools: List[Any] = field(default_factory=list)
     prompt_template: str = ""
     
+    # Whether cached LLM responses survive this context ("preserve") or are dropped after it runs ("flush")
+    cache_policy: Literal["preserve", "flush"] = "preserve"
+    
+    # Response caches dropped from memory by the "flush" policy, the default cache if empty
+    response_caches: List[Any] = field(default_factory=list, repr=False, compare=False)
+    
     # Function to execute when this context is run
-    _run_func: Optional[Callable] = None
+    _run_func: Optional[Callable] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Whether the run function takes the inputs as a second argument
+    _pass_inputs: bool = field(default=False, init=False, repr=False, compare=False)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Context":
+        """Create a context from a dictionary of field values, ignoring unknown keys."""
+        names = {f.name for f in fields(cls) if f.init}
+        return cls(**{k: v for k, v in data.items() if k in names})
     
     def set_run_function(self, func: Callable) -> None:
-        """Set the function to run when this context is executed."""
+        """Set the function to run when this context is executed.
+        
+        The function may be a plain function or a coroutine function. It is called as
+        `func(context, inputs)` with the inputs of that run if its second positional
+        parameter has no default, and as `func(context)` with the inputs merged into
+        `context.inputs` otherwise. Only the first
+        form is safe to run concurrently, since the context itself is not modified.
+        """
         self._run_func = func
+        self._pass_inputs = _takes_inputs(func)
     
     def run(self, **kwargs) -> Dict[str, Any]:
-        """Run this context with the given inputs."""
+        """Run this context with the given inputs.
+        
+        Coroutine run functions are run on an event loop kept for the calling thread,
+        so this cannot be called from a running event loop; await `run_async` there.
+        """
         if self._run_func is None:
             raise ValueError(f"No run function set for context {self.id}")
         
-        # Update inputs with kwargs
-        for key, value in kwargs.items():
-            self.inputs[key] = value
-            
         # Run the function
-        result = self._run_func(self)
+        if self._pass_inputs:
+            result = self._run_func(self, self._merge_inputs(kwargs))
+        else:
+            self.inputs.update(kwargs)
+            result = self._run_func(self)
+        if inspect.isawaitable(result):
+            result = _run_coroutine(result)
         
-        # Update outputs
-        if isinstance(result, dict):
+        # Update outputs, unless the function returned them itself
+        if result is not self.outputs and isinstance(result, dict):
             self.outputs.update(result)
         
         return self.outputs
     
+    async def run_async(self, **kwargs) -> Dict[str, Any]:
+        """Run this context with the given inputs without blocking the event loop.
+        
+        Coroutine run functions are awaited; plain run functions are run in the
+        loop's default executor, and an awaitable they return is awaited.
+        """
+        if self._run_func is None:
+            raise ValueError(f"No run function set for context {self.id}")
+        
+        if self._pass_inputs:
+            args = (self, self._merge_inputs(kwargs))
+        else:
+            self.inputs.update(kwargs)
+            args = (self,)
+        
+        # Run the function
+        if inspect.iscoroutinefunction(self._run_func):
+            result = await self._run_func(*args)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, self._run_func, *args)
+            
+            # Plain functions may still return an awaitable, e.g. a lambda wrapping a coroutine
+            if inspect.isawaitable(result):
+                result = await result
+        
+        # Update outputs, unless the function returned them itself
+        if result is not self.outputs and isinstance(result, dict):
+            self.outputs.update(result)
+        
+        return self.outputs
+    
+    def _merge_inputs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the inputs of a single run from the default inputs and the given ones."""
+        if not self.inputs:
+            return kwargs
+        return {**self.inputs, **kwargs}
+    
     def __str__(self) -> str:
         return f"Context({self.id}: {self.name})"
     
     def __repr__(self) -> str:
         return self.__str__()
+
+
+def _run_coroutine(awaitable: Awaitable) -> Any:
+    """Run an awaitable to completion on the calling thread's event loop.
+    
+    The loop is created on first use and reused afterwards, so synchronous code that
+    runs many coroutines does not pay for a new event loop each time.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        raise RuntimeError("Cannot block on a coroutine while an event loop is running; await "
+                           "Context.run_async or the async strategies instead")
+    
+    loop = getattr(_thread_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _thread_loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(awaitable)
+
+
+def _takes_inputs(func: Callable) -> bool:
+    """Check whether a run function requires the inputs as a second positional argument.
+    
+    Functions whose second parameter has a default, or that only take `*args`, are
+    called with the context alone.
+    """
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    
+    positional = [p for p in params
+                  if p.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    return len(positional) >= 2 and positional[1].default is inspect.Parameter.empty
@@ -0,0 +1,143 @@
+"""Run result memoization for AgenticFlow framework.
+
+This module defines the RunResultStore class which persists the outputs of context run
+functions on disk, keyed by a hash of the run function and its code, the context, its
+inputs and the ids of the upstream contexts, so unchanged steps are skipped on later executions.
+"""
+
+import atexit
+import hashlib
+import inspect
+import os
+import pickle
+import shelve
+import threading
+from types import CodeType
+from typing import Dict, Any, Callable, Optional, Sequence
+from .context import Context, _takes_inputs
+
+
+class RunResultStore:
+    """Persistent store for run function results, backed by `shelve`."""
+    
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the store; the shelf file is only opened on first use."""
+        self.path = path or os.path.join(os.path.expanduser("~"), ".cache", "agenticflow", "run_results")
+        self._shelf: Optional[shelve.Shelf] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(name: str, context_id: str, inputs: Dict[str, Any], upstream_ids: Sequence[str]) -> Optional[str]:
+        """Build a store key, or return None if the inputs cannot be pickled."""
+        try:
+            payload = pickle.dumps((name, context_id, sorted(inputs.items()), tuple(upstream_ids)))
+        except Exception:
+            return None
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get stored outputs, or None if the key is not stored."""
+        with self._lock:
+            return self._open().get(key)
+    
+    def set(self, key: str, outputs: Dict[str, Any]) -> None:
+        """Store the outputs of a run, skipping outputs that cannot be pickled."""
+        with self._lock:
+            try:
+                self._open()[key] = outputs
+            except (pickle.PicklingError, TypeError, AttributeError):
+                pass
+    
+    def clear(self) -> None:
+        """Drop all stored results."""
+        with self._lock:
+            self._open().clear()
+    
+    def close(self) -> None:
+        """Close the shelf file if it is open."""
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+    
+    def _open(self) -> shelve.Shelf:
+        """Open the shelf file, creating its directory if needed."""
+        if self._shelf is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._shelf = shelve.open(self.path)
+        return self._shelf
+
+
+# Create a global instance of the run result store
+default_store = RunResultStore()
+atexit.register(default_store.close)
+
+
+def memoize_run_function(func: Callable, upstream_ids: Sequence[str] = (),
+                         store: Optional[RunResultStore] = None) -> Callable:
+    """Wrap a run function so its results are looked up in a store before it is called.
+    
+    The returned function has the same calling convention as `func`. Its results are
+    keyed by the module, qualified name and code of `func`, the id of the context, the
+    inputs of the run and `upstream_ids`, so editing the function invalidates them.
+    """
+    if store is None:
+        store = default_store
+    name = _function_identity(func)
+    upstream_ids = tuple(upstream_ids)
+    
+    def lookup(context: Context, inputs: Dict[str, Any]):
+        key = store.make_key(name, context.id, inputs, upstream_ids)
+        return key, (store.get(key) if key is not None else None)
+    
+    def save(key: Optional[str], result: Any) -> Any:
+        if key is not None and isinstance(result, dict):
+            store.set(key, result)
+        return result
+    
+    if inspect.iscoroutinefunction(func):
+        if _takes_inputs(func):
+            async def run(context: Context, inputs: Dict[str, Any]) -> Any:
+                key, cached = lookup(context, inputs)
+                return cached if cached is not None else save(key, await func(context, inputs))
+        else:
+            async def run(context: Context) -> Any:
+                key, cached = lookup(context, context.inputs)
+                return cached if cached is not None else save(key, await func(context))
+    elif _takes_inputs(func):
+        def run(context: Context, inputs: Dict[str, Any]) -> Any:
+            key, cached = lookup(context, inputs)
+            return cached if cached is not None else save(key, func(context, inputs))
+    else:
+        def run(context: Context) -> Any:
+            key, cached = lookup(context, context.inputs)
+            return cached if cached is not None else save(key, func(context))
+    
+    # Keep the original function so memoization can be switched off again
+    run.__memoized__ = func
+    return run
+
+
+def _function_identity(func: Callable) -> str:
+    """Describe a function by its module, qualified name and a hash of its code."""
+    name = f"{getattr(func, '__module__', None)}.{getattr(func, '__qualname__', repr(func))}"
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return name
+    digest = hashlib.blake2b(digest_size=16)
+    _hash_code(code, digest)
+    return f"{name}:{digest.hexdigest()}"
+
+
+def _hash_code(code: CodeType, digest: "hashlib.blake2b") -> None:
+    """Feed the bytecode, names and constants of a code object, and its nested ones, to a hash."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(const, digest)
+        elif isinstance(const, frozenset):
+            # Set order depends on string hashing, which changes between processes
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
@@ -4,9 +4,20 @@ This module defines the Workflow class which represents a workflow of contexts.
 A workflow can be structured as a chain, tree, or graph of contexts.
 """
 
+import importlib.util
 import networkx as nx
 from typing import Dict, List, Any, Optional, Set
 from .context import Context
+from .memo import RunResultStore, memoize_run_function
+from ..models.cache import ResponseCache
+
+
+# Rendering settings for saved visualizations: simplify long edge paths and draw them in chunks
+_FILE_RC_PARAMS = {"path.simplify_threshold": 1.0, "agg.path.chunksize": 10000}
+
+# Version of how workflows are drawn; bump it when `_draw`, `_layout` or the rendering
+# settings change, so cached renders of unchanged workflows are not reused
+_RENDER_VERSION = 1
 
 
 class Workflow:
@@ -22,6 +33,17 @@ class Workflow:
         self.graph = nx.DiGraph()
         self.contexts: Dict[str, Context] = {}
         
+        # Plain adjacency kept alongside the graph so traversal never touches networkx;
+        # start contexts are kept in an insertion-ordered dict used as an ordered set
+        self._succ: Dict[str, List[str]] = {}
+        self._starts: Dict[str, None] = {}
+        
+        # Bumped on every structural change, so compiled artifacts can detect staleness
+        self._version = 0
+        
+        # Node positions from the last visualization, with the version they were computed for
+        self._cached_pos: Optional[tuple] = None
+        
     def add_context(self, context: Context) -> None:
         """Add a context to the workflow."""
         if context.id in self.contexts:
@@ -29,6 +51,9 @@ class Workflow:
         
         self.contexts[context.id] = context
         self.graph.add_node(context.id)
+        self._succ[context.id] = []
+        self._starts[context.id] = None
+        self._version += 1
         
     def connect(self, from_context_id: str, to_context_id: str, condition: Optional[str] = None) -> None:
         """Connect two contexts in the workflow."""
@@ -40,61 +65,143 @@ class Workflow:
         # Add edge with optional condition
         self.graph.add_edge(from_context_id, to_context_id, condition=condition)
         
+        # Connecting the same pair twice only updates the condition
+        successors = self._succ[from_context_id]
+        if to_context_id not in successors:
+            successors.append(to_context_id)
+            self._starts.pop(to_context_id, None)
+            self._version += 1
+        
+    def set_memory_policy(self, policy: str, context_ids: Optional[List[str]] = None,
+                          caches: Optional[List[ResponseCache]] = None) -> None:
+        """Set the LLM response cache policy of contexts in the workflow.
+        
+        With "preserve", cached responses are reused by later contexts; with "flush",
+        the in-memory responses of `caches`, or of the default cache if not given, are
+        dropped after the context runs. Persisted responses are never dropped. Applies
+        to all contexts unless `context_ids` is given.
+        """
+        if policy not in ("preserve", "flush"):
+            raise ValueError(f"Unknown memory policy '{policy}'")
+        
+        for ctx_id in context_ids if context_ids is not None else self.contexts:
+            if ctx_id not in self.contexts:
+                raise ValueError(f"Context with id {ctx_id} does not exist in workflow")
+            self.contexts[ctx_id].cache_policy = policy
+            if caches is not None:
+                self.contexts[ctx_id].response_caches = list(caches)
+        
+        # Compiled code captures the cache policies
+        self._version += 1
+    
+    def set_memoization(self, enabled: bool = True, context_ids: Optional[List[str]] = None,
+                        store: Optional[RunResultStore] = None) -> None:
+        """Persist the results of context run functions across executions.
+        
+        A memoized context skips its run function when it is run again with the same
+        inputs and upstream contexts, so only deterministic contexts should be memoized.
+        Call this after the contexts are connected and their run functions are set.
+        Applies to all contexts unless `context_ids` is given.
+        """
+        for ctx_id in context_ids if context_ids is not None else self.contexts:
+            if ctx_id not in self.contexts:
+                raise ValueError(f"Context with id {ctx_id} does not exist in workflow")
+            
+            context = self.contexts[ctx_id]
+            if context._run_func is None:
+                continue
+            func = getattr(context._run_func, "__memoized__", context._run_func)
+            if enabled:
+                func = memoize_run_function(func, tuple(self.graph.predecessors(ctx_id)), store)
+            context.set_run_function(func)
+        
     def get_next_contexts(self, context_id: str) -> List[Context]:
         """Get the next contexts after the given context."""
         if context_id not in self.contexts:
             raise ValueError(f"Context with id {context_id} does not exist in workflow")
         
-        next_context_ids = list(self.graph.successors(context_id))
-        return [self.contexts[ctx_id] for ctx_id in next_context_ids]
+        return [self.contexts[ctx_id] for ctx_id in self._succ[context_id]]
     
     def get_start_contexts(self) -> List[Context]:
         """Get all starting contexts (those with no predecessors)."""
-        start_nodes = [n for n in self.graph.nodes if self.graph.in_degree(n) == 0]
-        return [self.contexts[ctx_id] for ctx_id in start_nodes]
+        return [self.contexts[ctx_id] for ctx_id in self._starts]
     
     def get_end_contexts(self) -> List[Context]:
         """Get all ending contexts (those with no successors)."""
-        end_nodes = [n for n in self.graph.nodes if self.graph.out_degree(n) == 0]
-        return [self.contexts[ctx_id] for ctx_id in end_nodes]
+        return [self.contexts[ctx_id] for ctx_id, successors in self._succ.items() if not successors]
     
     def visualize(self, filename: str = None) -> None:
-        """Visualize the workflow graph."""
+        """Visualize the workflow graph.
+        
+        With a filename, the graph is rendered off-screen on a plain Agg figure, so no
+        interactive backend is loaded; otherwise it is shown with pyplot.
+        """
         try:
-            import matplotlib.pyplot as plt
-            
-            plt.figure(figsize=(12, 8))
-            pos = nx.spring_layout(self.graph)
-            
-            # Draw nodes
-            nx.draw_networkx_nodes(self.graph, pos, node_size=700)
-            
-            # Draw edges
-            nx.draw_networkx_edges(self.graph, pos, arrowsize=20)
-            
-            # Draw labels
-            labels = {ctx_id: self.contexts[ctx_id].name for ctx_id in self.graph.nodes}
-            nx.draw_networkx_labels(self.graph, pos, labels=labels)
-            
-            # Draw edge labels (conditions)
-            edge_labels = {(u, v): d.get('condition', '') 
-                          for u, v, d in self.graph.edges(data=True) 
-                          if d.get('condition')}
-            nx.draw_networkx_edge_labels(self.graph, pos, edge_labels=edge_labels)
-            
-            plt.title(f"Workflow: {self.name}")
-            plt.axis('off')
-            
             if filename:
-                plt.savefig(filename)
+                import matplotlib
+                from matplotlib.figure import Figure
+                
+                with matplotlib.rc_context(_FILE_RC_PARAMS):
+                    fig = Figure(figsize=(12, 8))
+                    self._draw(fig.add_subplot())
+                    fig.savefig(filename)
             else:
+                import matplotlib.pyplot as plt
+                
+                plt.figure(figsize=(12, 8))
+                self._draw(plt.gca())
                 plt.show()
                 
         except ImportError:
             print("Matplotlib is required for visualization")
+    
+    def _draw(self, ax: Any) -> None:
+        """Draw the workflow graph on a matplotlib axes."""
+        pos = self._layout()
+        
+        # Draw nodes
+        nx.draw_networkx_nodes(self.graph, pos, node_size=700, ax=ax)
+        
+        # Draw edges
+        nx.draw_networkx_edges(self.graph, pos, arrowsize=20, ax=ax)
+        
+        # Draw labels
+        labels = {ctx_id: self.contexts[ctx_id].name for ctx_id in self.graph.nodes}
+        nx.draw_networkx_labels(self.graph, pos, labels=labels, ax=ax)
+        
+        # Draw edge labels (conditions)
+        edge_labels = {(u, v): d.get('condition', '') 
+                      for u, v, d in self.graph.edges(data=True) 
+                      if d.get('condition')}
+        nx.draw_networkx_edge_labels(self.graph, pos, edge_labels=edge_labels, ax=ax)
+        
+        ax.set_title(f"Workflow: {self.name}")
+        ax.set_axis_off()
             
+    def _layout(self) -> Dict[str, Any]:
+        """Compute node positions, reusing them while the graph is unchanged.
+        
+        Uses the hierarchical Graphviz "dot" layout when pygraphviz is installed; otherwise
+        falls back to a seeded spring layout with fewer iterations for larger graphs.
+        """
+        if self._cached_pos is not None and self._cached_pos[0] == self._version:
+            return self._cached_pos[1]
+        
+        try:
+            pos = nx.nx_agraph.graphviz_layout(self.graph, prog='dot')
+        except ImportError:
+            pos = nx.spring_layout(self.graph, seed=0, iterations=max(5, 50 - len(self.contexts)))
+        
+        self._cached_pos = (self._version, pos)
+        return pos
+    
     def __str__(self) -> str:
         return f"Workflow({self.name}, {len(self.contexts)} contexts)"
     
     def __repr__(self) -> str:
         return self.__str__()
+
+
+def _layout_program() -> str:
+    """Name the layout `Workflow._layout` uses: "dot" when pygraphviz is installed, else "spring"."""
+    return "dot" if importlib.util.find_spec("pygraphviz") is not None else "spring"
@@ -0,0 +1,89 @@
+"""Response cache for AgenticFlow framework.
+
+This module defines the ResponseCache class which stores LLM completions keyed by a
+hash of the model and prompt, so identical prompts are answered without a network call.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+
+class ResponseCache:
+    """LRU cache for LLM responses, optionally persisted to disk.
+    
+    Persistence requires the optional `diskcache` package.
+    """
+    
+    def __init__(self, maxsize: int = 10_000, directory: Optional[str] = None):
+        """Initialize the response cache."""
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._disk = None
+        
+        if directory is not None:
+            try:
+                import diskcache
+            except ImportError:
+                raise ImportError("diskcache is required for a persistent response cache")
+            self._disk = diskcache.Cache(directory)
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the given parts."""
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None if the key is not cached."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            return value
+        
+        if self._disk is not None:
+            value = self._disk.get(key)
+            if value is not None:
+                self._store(key, value)
+        return value
+    
+    def set(self, key: str, value: str) -> None:
+        """Cache a response."""
+        self._store(key, value)
+        if self._disk is not None:
+            self._disk.set(key, value)
+    
+    def clear(self) -> None:
+        """Drop all cached responses, including the persisted ones."""
+        self._entries.clear()
+        if self._disk is not None:
+            self._disk.clear()
+    
+    def clear_memory(self) -> None:
+        """Drop the responses held in memory, keeping the persisted ones."""
+        self._entries.clear()
+    
+    def _store(self, key: str, value: str) -> None:
+        """Store a response in memory, evicting the least recently used one if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (self._disk is not None and key in self._disk)
+
+
+# Create a global instance of the response cache
+default_cache = ResponseCache()
+
+
+def flush_caches(caches: Iterable[ResponseCache] = ()) -> None:
+    """Drop the in-memory responses of the given caches, or of the default cache if none are given.
+    
+    Persisted responses are kept; call `ResponseCache.clear` to drop those too.
+    """
+    for cache in caches or (default_cache,):
+        cache.clear_memory()
@@ -1,45 +1,111 @@
 """LLM integration for AgenticFlow framework."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
 import os
-from langchain.llms import OpenAI
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+import re
+import asyncio
+from functools import lru_cache
+from .cache import ResponseCache, default_cache
+
+# langchain and openai are slow to import, so they are only imported once an LLM is used
+if TYPE_CHECKING:
+    from langchain.chains import LLMChain
+
+# Matches every {variable_name} placeholder in a prompt template
+_VAR_RE = re.compile(r'\{([^}]+)\}')
 
 
 class LLMProvider:
     """Provider for LLM integration."""
     
-    def __init__(self, api_key: Optional[str] = None, model_name: str = "gpt-3.5-turbo-instruct"):
-        """Initialize the LLM provider."""
+    def __init__(self, api_key: Optional[str] = None, model_name: str = "gpt-3.5-turbo-instruct",
+                 cache: Optional[ResponseCache] = None):
+        """Initialize the LLM provider.
+        
+        Responses are cached in `cache`, or in the shared default cache if none is given.
+        """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set it via the api_key parameter or OPENAI_API_KEY environment variable.")
         
+        try:
+            from openai import AsyncOpenAI
+            from langchain.llms import OpenAI
+        except ImportError:
+            raise ImportError("langchain and openai are required for LLM features; install the `llm` extra")
+        
         self.model_name = model_name
         self.llm = OpenAI(openai_api_key=self.api_key, model_name=model_name)
+        self.async_client = AsyncOpenAI(api_key=self.api_key)
+        self.cache = cache if cache is not None else default_cache
+        
+        # Requests currently in flight, so identical concurrent prompts share one call
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        # Chains built by generate_with_template, keyed by template and output key
+        self._chain_cache: Dict[Tuple[str, str], "LLMChain"] = {}
     
-    def create_chain(self, prompt_template: str, output_key: str = "result") -> LLMChain:
+    def create_chain(self, prompt_template: str, output_key: str = "result") -> "LLMChain":
         """Create an LLM chain with the given prompt template."""
+        from langchain.prompts import PromptTemplate
+        from langchain.chains import LLMChain
+        
         prompt = PromptTemplate(
-            input_variables=self._extract_variables(prompt_template),
+            input_variables=list(self._extract_variables(prompt_template)),
             template=prompt_template
         )
         return LLMChain(llm=self.llm, prompt=prompt, output_key=output_key)
     
-    def _extract_variables(self, template: str) -> List[str]:
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _extract_variables(template: str) -> Tuple[str, ...]:
         """Extract variables from a prompt template."""
-        import re
-        # Find all occurrences of {variable_name}
-        matches = re.findall(r'\{([^}]+)\}', template)
-        return matches
+        return tuple(_VAR_RE.findall(template))
     
     def generate(self, prompt: str, **kwargs) -> str:
         """Generate a response from the LLM."""
-        return self.llm(prompt)
+        key = ResponseCache.make_key(self.model_name, prompt)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.llm(prompt)
+            self.cache.set(key, result)
+        return result
+    
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """Generate a response from the LLM without blocking the event loop."""
+        key = ResponseCache.make_key(self.model_name, prompt)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._acomplete(key, prompt))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await task
+    
+    async def _acomplete(self, key: str, prompt: str) -> str:
+        """Request a completion from the async client and cache it."""
+        response = await self.async_client.completions.create(
+            model=self.model_name,
+            prompt=prompt,
+            max_tokens=self.llm.max_tokens,
+            temperature=self.llm.temperature
+        )
+        result = response.choices[0].text
+        self.cache.set(key, result)
+        return result
     
     def generate_with_template(self, template: str, **kwargs) -> str:
         """Generate a response using a template and variables."""
-        chain = self.create_chain(template)
-        result = chain.run(**kwargs)
+        key = ResponseCache.make_key(self.model_name, template, repr(sorted(kwargs.items())))
+        result = self.cache.get(key)
+        if result is None:
+            chain = self._chain_cache.get((template, "result"))
+            if chain is None:
+                chain = self.create_chain(template)
+                self._chain_cache[(template, "result")] = chain
+            result = chain.run(**kwargs)
+            self.cache.set(key, result)
         return result
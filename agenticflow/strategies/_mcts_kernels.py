@@ -0,0 +1,126 @@
+"""Compiled Monte Carlo Tree Search kernel.
+
+This module requires Numba; the MCTS strategy imports it on first use and falls back
+to its pure Python search if Numba is not installed.
+"""
+
+import math
+import numpy as np
+from typing import List, Sequence, Tuple
+from numba import njit
+
+
+def search(successor_flat: Sequence[int], successor_offsets: Sequence[int], root: int, iterations: int,
+           c: float, max_depth: int, seed: int) -> Tuple[List, ...]:
+    """Run the compiled MCTS loop and return the tree arrays as lists."""
+    arrays = _search(np.asarray(successor_flat, dtype=np.int64), np.asarray(successor_offsets, dtype=np.int64),
+                     root, iterations, c, max_depth, seed)
+    return tuple(a.tolist() for a in arrays)
+
+
+@njit(cache=True)
+def _grow(a: np.ndarray, capacity: int, fill) -> np.ndarray:
+    """Return a copy of `a` grown to `capacity`, with the new slots set to `fill`."""
+    grown = np.empty(capacity, a.dtype)
+    grown[:len(a)] = a
+    grown[len(a):] = fill
+    return grown
+
+
+@njit(cache=True)
+def _search(succ_flat: np.ndarray, succ_offsets: np.ndarray, root: int, iterations: int, c: float,
+           max_depth: int, seed: int):
+    """Run the whole MCTS loop over a CSR successor table.
+    
+    The tree layout matches `MCTSTree`: returns its `context_ids`, `parent`, `visits`,
+    `log_visits`, `value`, `child_start`, `child_count` and `child_tried` arrays,
+    trimmed to the number of nodes.
+    """
+    np.random.seed(seed)
+    
+    capacity = 64
+    context_ids = np.zeros(capacity, np.int64)
+    parent = np.full(capacity, -1, np.int64)
+    visits = np.zeros(capacity, np.int64)
+    log_visits = np.zeros(capacity, np.float64)
+    value = np.zeros(capacity, np.float64)
+    child_start = np.full(capacity, -1, np.int64)
+    child_count = np.zeros(capacity, np.int64)
+    child_tried = np.zeros(capacity, np.int64)
+    context_ids[0] = root
+    size = 1
+    
+    for _ in range(iterations):
+        # Selection and expansion
+        node = 0
+        while True:
+            start = child_start[node]
+            if start < 0:
+                first = succ_offsets[context_ids[node]]
+                count = succ_offsets[context_ids[node] + 1] - first
+                
+                # Grow the arrays, doubling their size, until the children fit
+                if size + count > capacity:
+                    while size + count > capacity:
+                        capacity *= 2
+                    context_ids = _grow(context_ids, capacity, 0)
+                    parent = _grow(parent, capacity, -1)
+                    visits = _grow(visits, capacity, 0)
+                    log_visits = _grow(log_visits, capacity, 0.0)
+                    value = _grow(value, capacity, 0.0)
+                    child_start = _grow(child_start, capacity, -1)
+                    child_count = _grow(child_count, capacity, 0)
+                    child_tried = _grow(child_tried, capacity, 0)
+                
+                # Allocate the children in random order with a Fisher-Yates shuffle
+                start = size
+                context_ids[start:start + count] = succ_flat[first:first + count]
+                for k in range(count - 1, 0, -1):
+                    j = np.random.randint(0, k + 1)
+                    context_ids[start + k], context_ids[start + j] = context_ids[start + j], context_ids[start + k]
+                parent[start:start + count] = node
+                child_start[node] = start
+                child_count[node] = count
+                size += count
+            
+            count = child_count[node]
+            if count == 0:
+                break
+            
+            # Expansion: take the next untried child
+            tried = child_tried[node]
+            if tried < count:
+                child_tried[node] = tried + 1
+                node = start + tried
+                break
+            
+            # Every child has been tried and backpropagated, so none has zero visits
+            log_n_visits = log_visits[node]
+            best_score = -math.inf
+            for child in range(start, start + count):
+                score = value[child] / visits[child] + c * math.sqrt(log_n_visits / visits[child])
+                if score > best_score:
+                    best_score = score
+                    node = child
+        
+        # Simulation
+        current = context_ids[node]
+        depth = 0
+        while depth < max_depth:
+            first = succ_offsets[current]
+            count = succ_offsets[current + 1] - first
+            if count == 0:
+                break
+            current = succ_flat[first + int(np.random.random() * count)]
+            depth += 1
+        result = 1.0 / (depth + 1) if depth > 0 else 1.0
+        
+        # Backpropagation
+        while node >= 0:
+            visits[node] += 1
+            log_visits[node] = math.log(visits[node])
+            value[node] += result
+            node = parent[node]
+    
+    return (context_ids[:size], parent[:size], visits[:size], log_visits[:size], value[:size],
+            child_start[:size], child_count[:size], child_tried[:size])
@@ -1,48 +1,101 @@
 """Breadth-First Search strategy for AgenticFlow framework."""
 
-from typing import Dict, Any, Set, Deque
-from collections import deque
+import asyncio
+from collections import ChainMap
+from typing import Dict, Any, List, Set, Tuple
 from ..core.workflow import Workflow
+from ..core.context import _run_coroutine
+from ..core.compiler import ExecutionGraph, WorkflowCompiler
+from ..core.action_model import run_context, run_context_async
 
 
-def bfs_strategy(workflow: Workflow, data: Dict[str, Any]) -> Dict[str, Any]:
+def bfs_strategy(workflow: Workflow, data: Dict[str, Any], concurrent: bool = False) -> Dict[str, Any]:
     """Execute a workflow using Breadth-First Search strategy.
     
     This strategy traverses the workflow graph breadth-first, executing all contexts
-    at the same level before moving to the next level.
+    at the same level before moving to the next level. Contexts on the same level
+    are independent of each other, so with `concurrent=True` each level is run
+    concurrently, as `bfs_strategy_async` does.
+    
+    Each context writes its outputs into a new ChainMap layer on top of the data it
+    was reached with, so sibling contexts share their parent's state instead of copying it.
     """
-    # Get start contexts
-    start_contexts = workflow.get_start_contexts()
-    if not start_contexts:
-        raise ValueError("Workflow has no start contexts")
+    if concurrent:
+        return _run_coroutine(bfs_strategy_async(workflow, data))
+    
+    eg = _compile(workflow)
+    
+    # Initialize the first level with start contexts
+    root = ChainMap(data)
+    frontier = [(start_id, root) for start_id in eg.trigger_ids]
+    visited = set()
+    result = dict(data)
+    
+    # Process one level at a time
+    while frontier:
+        level = _take_level(frontier, visited)
+        
+        # Execute each context on a new layer over the data it was reached with
+        updated = [run_context(eg.node_map[context_id], current_data.new_child(), eg.input_keys[context_id])
+                   for context_id, current_data in level]
+        
+        frontier = _next_frontier(eg, level, updated, visited, result)
     
-    # Initialize queue with start contexts
-    queue = deque([(ctx.id, data) for ctx in start_contexts])
+    return result
+
+
+async def bfs_strategy_async(workflow: Workflow, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute a workflow breadth-first on the running event loop, running each level concurrently."""
+    eg = _compile(workflow)
+    root = ChainMap(data)
+    frontier = [(start_id, root) for start_id in eg.trigger_ids]
     visited = set()
+    result = dict(data)
     
-    # Process queue
-    while queue:
-        context_id, current_data = queue.popleft()
+    while frontier:
+        level = _take_level(frontier, visited)
+        
+        updated = await asyncio.gather(*[run_context_async(eg.node_map[context_id], current_data.new_child(),
+                                                           eg.input_keys[context_id])
+                                         for context_id, current_data in level])
         
+        frontier = _next_frontier(eg, level, updated, visited, result)
+    
+    return result
+
+
+def _compile(workflow: Workflow) -> ExecutionGraph:
+    """Compile the workflow, checking that it has start contexts."""
+    eg = WorkflowCompiler.compile(workflow)
+    if not eg.trigger_ids:
+        raise ValueError("Workflow has no start contexts")
+    return eg
+
+
+def _take_level(frontier: List[Tuple[int, ChainMap]], visited: Set[int]) -> List[Tuple[int, ChainMap]]:
+    """Drop already visited contexts from a frontier and mark the rest as visited."""
+    level = []
+    for context_id, current_data in frontier:
         # Skip if already visited
         if context_id in visited:
             continue
-            
+        
         # Mark as visited
         visited.add(context_id)
+        level.append((context_id, current_data))
+    return level
+
+
+def _next_frontier(eg: ExecutionGraph, level: List[Tuple[int, ChainMap]], updated: List[ChainMap],
+                   visited: Set[int], result: Dict[str, Any]) -> List[Tuple[int, ChainMap]]:
+    """Merge the outputs of a level into the result and collect the next level."""
+    frontier = []
+    for (context_id, _), updated_data in zip(level, updated):
+        # Only the context's own layer is new, its parents were merged earlier
+        result.update(updated_data.maps[0])
         
-        # Get the context
-        context = workflow.contexts[context_id]
-        
-        # Execute the context
-        from ..core.action_model import ActionModel
-        action_model = ActionModel()
-        updated_data = action_model.execute_context(context, current_data.copy())
-        
-        # Get next contexts and add to queue
-        next_contexts = workflow.get_next_contexts(context_id)
-        for next_context in next_contexts:
-            if next_context.id not in visited:
-                queue.append((next_context.id, updated_data))
-    
-    return data
+        # Get next contexts and add to the next level
+        for next_id in eg.connection_map[context_id]:
+            if next_id not in visited:
+                frontier.append((next_id, updated_data))
+    return frontier
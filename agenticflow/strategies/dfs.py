@@ -1,7 +1,9 @@
 """Depth-First Search strategy for AgenticFlow framework."""
 
-from typing import Dict, Any, Set
+from typing import Dict, Any
 from ..core.workflow import Workflow
+from ..core.compiler import WorkflowCompiler
+from ..core.action_model import run_context
 
 
 def dfs_strategy(workflow: Workflow, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -10,43 +12,32 @@ def dfs_strategy(workflow: Workflow, data: Dict[str, Any]) -> Dict[str, Any]:
     This strategy traverses the workflow graph depth-first, executing each context
     and following the first available path until reaching an end context.
     """
-    # Get start contexts
-    start_contexts = workflow.get_start_contexts()
-    if not start_contexts:
+    # Compile the workflow and get start contexts
+    eg = WorkflowCompiler.compile(workflow)
+    if not eg.trigger_ids:
         raise ValueError("Workflow has no start contexts")
     
     # Track visited contexts to avoid cycles
     visited = set()
     
-    # Execute DFS from each start context
-    for start_context in start_contexts:
-        data = _dfs_execute(workflow, start_context.id, data, visited)
-    
-    return data
-
-
-def _dfs_execute(workflow: Workflow, context_id: str, data: Dict[str, Any], visited: Set[str]) -> Dict[str, Any]:
-    """Recursively execute contexts in depth-first order."""
-    # Skip if already visited
-    if context_id in visited:
-        return data
-    
-    # Mark as visited
-    visited.add(context_id)
-    
-    # Get the context
-    context = workflow.contexts[context_id]
-    
-    # Execute the context
-    from ..core.action_model import ActionModel
-    action_model = ActionModel()
-    data = action_model.execute_context(context, data)
-    
-    # Get next contexts
-    next_contexts = workflow.get_next_contexts(context_id)
-    
-    # Execute each next context
-    for next_context in next_contexts:
-        data = _dfs_execute(workflow, next_context.id, data, visited)
+    # Seed the stack so the first start context is popped first
+    stack = list(reversed(eg.trigger_ids))
+    
+    while stack:
+        context_id = stack.pop()
+        
+        # Skip if already visited
+        if context_id in visited:
+            continue
+        
+        # Mark as visited
+        visited.add(context_id)
+        
+        # Execute the context
+        data = run_context(eg.node_map[context_id], data, eg.input_keys[context_id])
+        
+        # Push next contexts in reverse so they are visited in declaration order
+        stack.extend(next_id for next_id in reversed(eg.connection_map[context_id])
+                     if next_id not in visited)
     
     return data
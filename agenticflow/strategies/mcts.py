@@ -1,175 +1,241 @@
-"""Monte Carlo Tree Search strategy for AgenticFlow framework."""
+"""Monte Carlo Tree Search strategy for AgenticFlow framework.
+
+The search runs as plain Python over a list-based tree. Large searches can instead run
+the whole loop in a compiled kernel when Numba is installed (the `jit` extra).
+"""
 
-import random
 import math
-from typing import Dict, Any, List, Optional, Tuple
-import networkx as nx
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, List, Optional
 from ..core.workflow import Workflow
+from ..core.compiler import ExecutionGraph, WorkflowCompiler
+from ..core.action_model import run_context
 
+# Random number generator used by the search, seeded through mcts_strategy
+_rng = random.Random()
 
-class MCTSNode:
-    """Node in the Monte Carlo Tree Search."""
-    
-    def __init__(self, context_id: str, parent=None):
-        """Initialize a MCTS node."""
-        self.context_id = context_id
-        self.parent = parent
-        self.children: List[MCTSNode] = []
-        self.visits = 0
-        self.value = 0.0
-        self.untried_actions: List[str] = []
-        
-    def add_child(self, context_id: str) -> 'MCTSNode':
-        """Add a child node."""
-        child = MCTSNode(context_id, self)
-        self.children.append(child)
-        return child
-    
-    def update(self, result: float) -> None:
-        """Update node statistics."""
-        self.visits += 1
-        self.value += result
-        
-    def uct_select_child(self, exploration_weight: float = 1.0) -> 'MCTSNode':
-        """Select a child using UCT formula."""
-        log_n_visits = math.log(self.visits) if self.visits > 0 else 0
-        
-        def uct_score(node):
-            exploitation = node.value / node.visits if node.visits > 0 else 0
-            exploration = exploration_weight * math.sqrt(log_n_visits / node.visits) if node.visits > 0 else float('inf')
-            return exploitation + exploration
-        
-        return max(self.children, key=uct_score)
-    
-    def is_fully_expanded(self) -> bool:
-        """Check if all possible actions have been tried."""
-        return len(self.untried_actions) == 0
+# The compiled search kernel, imported on first use since importing Numba is slow;
+# False once the import has failed
+_search_kernel = None
+
+# Search size, in iterations times contexts, above which the compiled kernel is used by
+# default; importing Numba and loading the kernel costs a few hundred milliseconds
+JIT_MIN_WORK = 5_000_000
+
+
+@dataclass
+class MCTSTree:
+    """Monte Carlo search tree stored as parallel lists.
+    
+    Nodes are referred to by their index into the lists, and the root is node 0.
+    The children of a node are allocated together, in random order, the first time
+    the node is reached, so they occupy the contiguous range
+    `child_start[i]:child_start[i] + child_count[i]`. The first `child_tried[i]` of
+    them have been expanded. `log_visits` caches the log of `visits`.
+    """
     
-    def best_child(self) -> 'MCTSNode':
-        """Return the best child based on value."""
-        return max(self.children, key=lambda c: c.value / c.visits if c.visits > 0 else 0)
+    context_ids: List[int] = field(default_factory=list)
+    parent: List[int] = field(default_factory=list)
+    visits: List[int] = field(default_factory=list)
+    log_visits: List[float] = field(default_factory=list)
+    value: List[float] = field(default_factory=list)
+    child_start: List[int] = field(default_factory=list)
+    child_count: List[int] = field(default_factory=list)
+    child_tried: List[int] = field(default_factory=list)
+    
+    def add_nodes(self, context_ids: List[int], parent: int = -1) -> int:
+        """Add one node per context id and return the index of the first one."""
+        start = len(self.context_ids)
+        count = len(context_ids)
+        self.context_ids.extend(context_ids)
+        self.parent.extend([parent] * count)
+        self.visits.extend([0] * count)
+        self.log_visits.extend([0.0] * count)
+        self.value.extend([0.0] * count)
+        self.child_start.extend([-1] * count)
+        self.child_count.extend([0] * count)
+        self.child_tried.extend([0] * count)
+        return start
 
 
-def mcts_strategy(workflow: Workflow, data: Dict[str, Any], iterations: int = 100) -> Dict[str, Any]:
+def mcts_strategy(workflow: Workflow, data: Dict[str, Any], iterations: int = 100,
+                  seed: Optional[int] = None, exploration_weight: float = 1.0,
+                  jit: Optional[bool] = None) -> Dict[str, Any]:
     """Execute a workflow using Monte Carlo Tree Search strategy.
     
     This strategy uses MCTS to find the optimal path through the workflow graph.
+    Pass `seed` to make the search reproducible. With `jit=True` the search runs in
+    the Numba kernel, with `jit=False` in plain Python; by default the kernel is only
+    used, if Numba is installed, when `iterations * len(workflow)` exceeds `JIT_MIN_WORK`.
     """
-    # Get start contexts
-    start_contexts = workflow.get_start_contexts()
-    if not start_contexts:
+    # Compile the workflow and get start contexts
+    eg = WorkflowCompiler.compile(workflow)
+    if not eg.trigger_ids:
         raise ValueError("Workflow has no start contexts")
     
-    # Initialize the root node with the first start context
-    root = MCTSNode(start_contexts[0].id)
+    if seed is not None:
+        _rng.seed(seed)
+    
+    kernel = None
+    if jit or (jit is None and iterations * len(eg) > JIT_MIN_WORK):
+        kernel = _load_search_kernel()
+        if kernel is None and jit:
+            raise ImportError("numba is required for jit=True; install the `jit` extra")
+    if kernel is not None:
+        # Run the whole search in the compiled kernel, seeded from our generator
+        tree = MCTSTree(*kernel(eg.successor_flat, eg.successor_offsets, eg.trigger_ids[0], iterations,
+                                exploration_weight, 10, _rng.getrandbits(32)))
+        return _execute_best_path(tree, eg, data)
     
-    # Initialize untried actions for the root node
-    root.untried_actions = list(workflow.graph.successors(root.context_id))
+    # Initialize the tree with the first start context as its root
+    tree = MCTSTree()
+    tree.add_nodes([eg.trigger_ids[0]])
     
     # Run MCTS iterations
     for _ in range(iterations):
-        # Selection
-        node = _select(root, workflow)
-        
-        # Expansion
-        if node.untried_actions:
-            node = _expand(node, workflow)
+        # Selection and expansion
+        node = _select(tree, eg, exploration_weight)
         
         # Simulation
-        result = _simulate(node, workflow)
+        result = _simulate(eg, tree.context_ids[node])
         
         # Backpropagation
-        _backpropagate(node, result)
+        _backpropagate(tree, node, result)
     
     # Execute the best path found by MCTS
-    return _execute_best_path(root, workflow, data)
+    return _execute_best_path(tree, eg, data)
 
 
-def _select(node: MCTSNode, workflow: Workflow) -> MCTSNode:
-    """Select a node to expand."""
-    while node.is_fully_expanded() and node.children:
-        node = node.uct_select_child()
-        # Update untried actions for the selected node
-        if not node.untried_actions:
-            node.untried_actions = list(workflow.graph.successors(node.context_id))
-    return node
+def _load_search_kernel() -> Optional[Callable]:
+    """Import the compiled search kernel, or return None if Numba is not installed."""
+    global _search_kernel
+    if _search_kernel is None:
+        try:
+            from ._mcts_kernels import search
+            _search_kernel = search
+        except ImportError:
+            _search_kernel = False
+    return _search_kernel or None
 
 
-def _expand(node: MCTSNode, workflow: Workflow) -> MCTSNode:
-    """Expand a node by adding a child."""
-    if not node.untried_actions:
-        return node
+def _select(tree: MCTSTree, eg: ExecutionGraph, exploration_weight: float) -> int:
+    """Descend the tree with UCT and return the node to simulate from.
     
-    # Choose a random untried action
-    action = random.choice(node.untried_actions)
-    node.untried_actions.remove(action)
-    
-    # Add a child node
-    child = node.add_child(action)
-    child.untried_actions = list(workflow.graph.successors(action))
-    
-    return child
+    The descent stops at a random untried child of the first node that has one,
+    or at a node without successors.
+    """
+    visits = tree.visits
+    value = tree.value
+    node = 0
+    while True:
+        start = tree.child_start[node]
+        if start < 0:
+            # Allocate the children the first time a node is reached; shuffling them
+            # makes expanding them in order equivalent to picking random untried ones
+            successors = list(eg.connection_map[tree.context_ids[node]])
+            _rng.shuffle(successors)
+            start = tree.add_nodes(successors, node)
+            tree.child_start[node] = start
+            tree.child_count[node] = len(successors)
+        
+        count = tree.child_count[node]
+        if count == 0:
+            return node
+        
+        # Expansion: take the next untried child
+        tried = tree.child_tried[node]
+        if tried < count:
+            tree.child_tried[node] = tried + 1
+            return start + tried
+        
+        # Every child has been tried and backpropagated, so none has zero visits
+        log_n_visits = tree.log_visits[node]
+        best_score = -math.inf
+        for child in range(start, start + count):
+            n = visits[child]
+            score = value[child] / n + exploration_weight * math.sqrt(log_n_visits / n)
+            if score > best_score:
+                best_score = score
+                node = child
 
 
-def _simulate(node: MCTSNode, workflow: Workflow) -> float:
-    """Simulate a random playout from the given node."""
-    current_id = node.context_id
-    depth = 0
-    max_depth = 10  # Prevent infinite loops
+def _simulate(eg: ExecutionGraph, context_id: int, max_depth: int = 10) -> float:
+    """Simulate a random playout from the given context.
     
-    # Simulate until we reach an end node or max depth
+    The playout is capped at `max_depth` steps to prevent infinite loops.
+    """
+    connection_map = eg.connection_map
+    draw = _rng.random
+    depth = 0
     while depth < max_depth:
-        # Get next possible contexts
-        next_ids = list(workflow.graph.successors(current_id))
+        next_ids = connection_map[context_id]
         
-        # If no next contexts, we've reached an end node
+        # No next contexts, we've reached an end node
         if not next_ids:
             break
-            
-        # Choose a random next context
-        current_id = random.choice(next_ids)
+        
+        context_id = next_ids[int(draw() * len(next_ids))]
         depth += 1
     
     # Simple reward function: inverse of depth (shorter paths are better)
     return 1.0 / (depth + 1) if depth > 0 else 1.0
 
 
-def _backpropagate(node: MCTSNode, result: float) -> None:
-    """Backpropagate the result up the tree."""
-    while node:
-        node.update(result)
-        node = node.parent
+def _backpropagate(tree: MCTSTree, node: int, result: float) -> None:
+    """Add a playout result to a node and all of its ancestors.
+    
+    `log_visits` is kept in step with `visits`, so selection never has to take a log.
+    """
+    parent = tree.parent
+    visits = tree.visits
+    log_visits = tree.log_visits
+    value = tree.value
+    log = math.log
+    while node >= 0:
+        visits[node] += 1
+        log_visits[node] = log(visits[node])
+        value[node] += result
+        node = parent[node]
 
 
-def _execute_best_path(root: MCTSNode, workflow: Workflow, data: Dict[str, Any]) -> Dict[str, Any]:
+def _best_child(tree: MCTSTree, node: int) -> int:
+    """Return the child with the best mean value, or -1 if the node has no children."""
+    count = tree.child_count[node]
+    if count == 0:
+        return -1
+    
+    start = tree.child_start[node]
+    visits = tree.visits
+    value = tree.value
+    return max(range(start, start + count), key=lambda i: value[i] / visits[i] if visits[i] > 0 else 0.0)
+
+
+def _execute_best_path(tree: MCTSTree, eg: ExecutionGraph, data: Dict[str, Any]) -> Dict[str, Any]:
     """Execute the best path found by MCTS."""
-    from ..core.action_model import ActionModel
-    action_model = ActionModel()
-    
     # Start with the root node
-    current_node = root
+    node = 0
+    context_id = tree.context_ids[0]
     visited = set()
     
     # Execute contexts along the best path
-    while current_node and current_node.context_id not in visited:
+    while context_id not in visited:
         # Mark as visited
-        visited.add(current_node.context_id)
+        visited.add(context_id)
         
         # Execute the context
-        context = workflow.contexts[current_node.context_id]
-        data = action_model.execute_context(context, data)
+        data = run_context(eg.node_map[context_id], data, eg.input_keys[context_id])
         
         # Move to the best child if any
-        if current_node.children:
-            current_node = current_node.best_child()
+        node = _best_child(tree, node) if node >= 0 else -1
+        if node >= 0:
+            context_id = tree.context_ids[node]
         else:
-            # No more children, try to get next contexts from the workflow
-            next_contexts = workflow.get_next_contexts(current_node.context_id)
-            if next_contexts:
-                # Create a new node for the first next context
-                current_node = MCTSNode(next_contexts[0].id)
-            else:
+            # Off the search tree, follow the first next context from the workflow
+            next_ids = eg.connection_map[context_id]
+            if not next_ids:
                 # No more contexts to execute
-                current_node = None
+                break
+            context_id = next_ids[0]
     
     return data
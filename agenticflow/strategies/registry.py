@@ -5,6 +5,7 @@ from ..core.workflow import Workflow
 from .dfs import dfs_strategy
 from .bfs import bfs_strategy
 from .mcts import mcts_strategy
+from .topo import topo_strategy
 
 
 class StrategyRegistry:
@@ -16,6 +17,7 @@ class StrategyRegistry:
             "dfs": dfs_strategy,
             "bfs": bfs_strategy,
             "mcts": mcts_strategy,
+            "topo": topo_strategy,
         }
     
     def register(self, name: str, strategy_func: Callable) -> None:
@@ -0,0 +1,67 @@
+"""Topological order strategy for AgenticFlow framework."""
+
+import asyncio
+from collections import ChainMap
+from typing import Dict, Any
+from ..core.workflow import Workflow
+from ..core.context import _run_coroutine
+from ..core.compiler import ExecutionGraph, WorkflowCompiler
+from ..core.action_model import run_context, run_context_async
+
+
+def topo_strategy(workflow: Workflow, data: Dict[str, Any], concurrent: bool = False) -> Dict[str, Any]:
+    """Execute a workflow in topological order.
+    
+    This strategy runs every context exactly once, after all of its predecessors,
+    in a single pass over the order computed by the workflow compiler. It only
+    supports acyclic workflows. With `concurrent=True`, the contexts are run in
+    waves, as `topo_strategy_async` does.
+    """
+    if concurrent:
+        return _run_coroutine(topo_strategy_async(workflow, data))
+    
+    eg = _compile(workflow)
+    
+    # Execute each context in order
+    for context_id in eg.topological_order:
+        data = run_context(eg.node_map[context_id], data, eg.input_keys[context_id])
+    
+    return data
+
+
+async def topo_strategy_async(workflow: Workflow, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute a workflow on the running event loop in waves of ready contexts.
+    
+    Each wave holds the contexts whose predecessors all finished in earlier waves,
+    and runs concurrently; the next wave starts once the whole wave has finished.
+    """
+    eg = _compile(workflow)
+    masks = eg.predecessor_masks
+    done_mask = 0
+    ready = list(eg.trigger_ids)
+    
+    while ready:
+        # Each context writes into its own layer, merged in order once the wave is done
+        updated = await asyncio.gather(*[run_context_async(eg.node_map[context_id], ChainMap({}, data),
+                                                           eg.input_keys[context_id])
+                                         for context_id in ready])
+        
+        for context_id, updated_data in zip(ready, updated):
+            data.update(updated_data.maps[0])
+            done_mask |= 1 << context_id
+        
+        # A successor is ready once all of its predecessors have finished
+        candidates = dict.fromkeys(next_id for context_id in ready for next_id in eg.connection_map[context_id])
+        ready = [next_id for next_id in candidates if done_mask & masks[next_id] == masks[next_id]]
+    
+    return data
+
+
+def _compile(workflow: Workflow) -> ExecutionGraph:
+    """Compile the workflow, checking that it has start contexts and no cycles."""
+    eg = WorkflowCompiler.compile(workflow)
+    if not eg.trigger_ids:
+        raise ValueError("Workflow has no start contexts")
+    if eg.topological_order is None:
+        raise ValueError(f"Workflow {workflow.name} contains a cycle and cannot be executed in topological order")
+    return eg
@@ -1,10 +1,11 @@
 """Base tool implementation for AgenticFlow framework."""
 
+from dataclasses import dataclass, fields
 from typing import Dict, Any, Callable, Optional, List
-from pydantic import BaseModel, Field
 
 
-class Tool(BaseModel):
+@dataclass(slots=True)
+class Tool:
     """Base class for tools in AgenticFlow.
     
     Tools provide functionality that can be used by contexts in a workflow.
@@ -14,6 +15,12 @@ class Tool(BaseModel):
     description: str
     func: Callable
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Tool":
+        """Create a tool from a dictionary of field values, ignoring unknown keys."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+    
     def run(self, **kwargs) -> Any:
         """Run the tool with the given arguments."""
         return self.func(**kwargs)
@@ -51,8 +58,18 @@ class ToolRegistry:
 default_registry = ToolRegistry()
 
 
-def register_tool(name: str, description: str, func: Callable) -> Tool:
-    """Register a tool in the default registry."""
+def register_tool(name: str, description: str, func: Optional[Callable] = None) -> Any:
+    """Register a tool in the default registry.
+    
+    When `func` is omitted, returns a decorator that registers the decorated function
+    and returns it unchanged, so it can still be called with positional arguments.
+    """
+    if func is None:
+        def decorator(f: Callable) -> Callable:
+            register_tool(name, description, f)
+            return f
+        return decorator
+    
     tool = Tool(name=name, description=description, func=func)
     default_registry.register(tool)
     return tool
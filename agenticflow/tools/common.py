@@ -2,9 +2,22 @@
 
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, List, Optional
 from .base import register_tool
 
+# orjson is an optional, much faster JSON codec; fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared session so repeated requests reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
 
 @register_tool(
     name="http_request",
@@ -14,19 +27,21 @@ def http_request(url: str, method: str = "GET", headers: Optional[Dict[str, str]
                 data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Make an HTTP request to a URL."""
     headers = headers or {}
+    method = method.upper()
     
-    response = requests.request(
-        method=method.upper(),
+    response = _SESSION.request(
+        method=method,
         url=url,
         headers=headers,
-        json=data if method.upper() in ["POST", "PUT", "PATCH"] and data else None,
-        params=data if method.upper() == "GET" and data else None
+        json=data if method in ["POST", "PUT", "PATCH"] and data else None,
+        params=data if method == "GET" and data else None
     )
+    content_type = response.headers.get("content-type", "")
     
     try:
         return {
             "status_code": response.status_code,
-            "content": response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text,
+            "content": _loads(response.content) if content_type.startswith("application/json") else response.text,
             "headers": dict(response.headers)
         }
     except json.JSONDecodeError:
@@ -63,8 +78,11 @@ def file_write(filepath: str, content: str) -> bool:
     description="Parse a JSON string into a Python object"
 )
 def json_parse(json_str: str) -> Dict[str, Any]:
-    """Parse a JSON string into a Python object."""
-    return json.loads(json_str)
+    """Parse a JSON string into a Python object.
+    
+    With orjson installed, integers beyond 64 bits are parsed as floats.
+    """
+    return _loads(json_str)
 
 
 @register_tool(
@@ -72,6 +90,31 @@ def json_parse(json_str: str) -> Dict[str, Any]:
     description="Convert a Python object to a JSON string"
 )
 def json_stringify(obj: Any, pretty: bool = False) -> str:
-    """Convert a Python object to a JSON string."""
-    indent = 2 if pretty else None
-    return json.dumps(obj, indent=indent)
+    """Convert a Python object to a JSON string.
+    
+    The output is compact and keeps non-ASCII characters whether or not orjson is
+    installed, except that orjson writes NaN and infinities as null.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except orjson.JSONEncodeError:
+            # orjson cannot encode integers beyond 64 bits, the standard library can
+            pass
+    
+    # Match orjson's output when it is not installed or cannot encode the object
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _loads(data: Any) -> Any:
+    """Parse JSON from a string or bytes."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN and Infinity, the standard library accepts them
+            pass
+    return json.loads(data)
@@ -1,9 +1,38 @@
 """Simple UI implementation for AgenticFlow framework."""
 
-from typing import Dict, Any, List, Optional
-from ..core.workflow import Workflow
+import hashlib
+import io
+import os
+import shutil
+import sys
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Callable
+from ..core.workflow import Workflow, _RENDER_VERSION, _layout_program
 from ..core.context import Context
 
+# readline adds line editing, history and tab completion to input() where available
+try:
+    import readline
+except ImportError:
+    readline = None
+
+# File the interactive input history is kept in between sessions
+HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".agenticflow_history")
+
+# Number of input lines kept in the history file
+HISTORY_LENGTH = 1000
+
+# Directory rendered workflow visualizations are cached in
+VIZ_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "agenticflow", "viz")
+
+# Command menu shown on every iteration of the interactive loop
+_MENU = (
+    "\nAvailable commands:\n"
+    "  1. List workflows\n"
+    "  2. Display workflow\n"
+    "  3. Visualize workflow\n"
+    "  4. Exit\n"
+)
+
 
 class SimpleUI:
     """Simple UI for AgenticFlow framework.
@@ -15,10 +44,34 @@ class SimpleUI:
     def __init__(self):
         """Initialize the simple UI."""
         self.workflows: Dict[str, Workflow] = {}
+        
+        # Context names of each registered workflow, keyed by context id
+        self._name_by_id: Dict[str, Dict[str, str]] = {}
+        
+        # Connections of each registered workflow as (from id, to id, condition) tuples
+        self._edges: Dict[str, List[Tuple[str, str, str]]] = {}
+        
+        # Interactive commands by menu choice; a handler returns True to leave the loop
+        self._commands: Dict[str, Callable[[], bool]] = {
+            "1": self._cmd_list,
+            "2": self._cmd_display,
+            "3": self._cmd_visualize,
+            "4": self._cmd_exit,
+        }
+        
+        # Readline completer, delimiters, history length and history to restore after a session
+        self._saved_readline: Optional[Tuple[Any, str, int, List[str]]] = None
     
     def register_workflow(self, workflow: Workflow) -> None:
-        """Register a workflow with the UI."""
+        """Register a workflow with the UI.
+        
+        The context names and connections are captured here, so register the workflow
+        again after changing it.
+        """
         self.workflows[workflow.name] = workflow
+        self._name_by_id[workflow.name] = {ctx_id: context.name for ctx_id, context in workflow.contexts.items()}
+        self._edges[workflow.name] = [(from_id, to_id, data.get('condition', ''))
+                                      for from_id, to_id, data in workflow.graph.edges(data=True)]
         
     def list_workflows(self) -> List[str]:
         """List all registered workflows."""
@@ -30,26 +83,31 @@ class SimpleUI:
             print(f"Workflow '{workflow_name}' not found")
             return
         
+        # Write everything at once instead of one print per line
+        sys.stdout.write(self.format_workflow(workflow_name))
+    
+    def format_workflow(self, workflow_name: str) -> str:
+        """Format the information shown by `display_workflow` as a string."""
         workflow = self.workflows[workflow_name]
-        print(f"Workflow: {workflow.name}")
-        print(f"Description: {workflow.description}")
-        print(f"Contexts: {len(workflow.contexts)}")
+        name_by_id = self._name_by_id[workflow_name]
+        buf = io.StringIO()
+        w = buf.write
+        w(f"Workflow: {workflow.name}\n")
+        w(f"Description: {workflow.description}\n")
+        w(f"Contexts: {len(workflow.contexts)}\n")
         
         # Display contexts
-        print("\nContexts:")
-        for context_id, context in workflow.contexts.items():
-            print(f"  - {context.id}: {context.name}")
-            
+        w("\nContexts:\n")
+        for context_id, name in name_by_id.items():
+            w(f"  - {context_id}: {name}\n")
+        
         # Display connections
-        print("\nConnections:")
-        for from_id, to_id in workflow.graph.edges():
-            from_name = workflow.contexts[from_id].name
-            to_name = workflow.contexts[to_id].name
-            condition = workflow.graph[from_id][to_id].get('condition', '')
-            if condition:
-                print(f"  - {from_name} -> {to_name} [if {condition}]")
-            else:
-                print(f"  - {from_name} -> {to_name}")
+        w("\nConnections:\n")
+        for from_id, to_id, condition in self._edges[workflow_name]:
+            w(f"  - {name_by_id[from_id]} -> {name_by_id[to_id]}")
+            w(f" [if {condition}]\n" if condition else "\n")
+        
+        return buf.getvalue()
     
     def visualize_workflow(self, workflow_name: str, filename: Optional[str] = None) -> None:
         """Visualize a workflow."""
@@ -58,76 +116,184 @@ class SimpleUI:
             return
         
         workflow = self.workflows[workflow_name]
-        workflow.visualize(filename)
-        
-        if filename:
+        if not filename:
+            workflow.visualize()
+        elif save_visualization(workflow, filename):
             print(f"Workflow visualization saved to {filename}")
     
     def run_interactive(self) -> None:
         """Run the UI in interactive mode."""
-        print("AgenticFlow Simple UI")
-        print("=====================")
+        self._load_history()
+        try:
+            self._run_loop()
+        finally:
+            self._save_history()
+            self._restore_readline()
+    
+    def _run_loop(self) -> None:
+        """Read and handle commands until the user exits."""
+        sys.stdout.write("AgenticFlow Simple UI\n=====================\n")
         
         while True:
-            print("\nAvailable commands:")
-            print("  1. List workflows")
-            print("  2. Display workflow")
-            print("  3. Visualize workflow")
-            print("  4. Exit")
+            # Paint the whole menu with a single write
+            sys.stdout.write(_MENU)
+            sys.stdout.flush()
             
-            choice = input("\nEnter your choice (1-4): ")
+            choice = self._read_input("\nEnter your choice (1-4): ")
             
-            if choice == "1":
-                workflows = self.list_workflows()
-                if workflows:
-                    print("\nAvailable workflows:")
-                    for i, name in enumerate(workflows, 1):
-                        print(f"  {i}. {name}")
-                else:
-                    print("\nNo workflows registered")
-                    
-            elif choice == "2":
-                workflows = self.list_workflows()
-                if not workflows:
-                    print("\nNo workflows registered")
-                    continue
-                    
-                print("\nAvailable workflows:")
-                for i, name in enumerate(workflows, 1):
-                    print(f"  {i}. {name}")
-                    
-                try:
-                    idx = int(input("\nEnter workflow number: ")) - 1
-                    if 0 <= idx < len(workflows):
-                        self.display_workflow(workflows[idx])
-                    else:
-                        print("Invalid workflow number")
-                except ValueError:
-                    print("Invalid input")
-                    
-            elif choice == "3":
-                workflows = self.list_workflows()
-                if not workflows:
-                    print("\nNo workflows registered")
-                    continue
-                    
-                print("\nAvailable workflows:")
-                for i, name in enumerate(workflows, 1):
-                    print(f"  {i}. {name}")
-                    
-                try:
-                    idx = int(input("\nEnter workflow number: ")) - 1
-                    if 0 <= idx < len(workflows):
-                        filename = input("Enter filename to save visualization (leave empty to display): ")
-                        self.visualize_workflow(workflows[idx], filename or None)
-                    else:
-                        print("Invalid workflow number")
-                except ValueError:
-                    print("Invalid input")
-                    
-            elif choice == "4":
-                print("\nExiting AgenticFlow UI")
-                break
-                
-            else:
+            handler = self._commands.get(choice)
+            if handler is None:
                 print("\nInvalid choice. Please enter a number between 1 and 4.")
+            elif handler():
+                break
+    
+    def _cmd_list(self) -> bool:
+        """List the registered workflows."""
+        workflows = self.list_workflows()
+        if workflows:
+            self._print_workflows(workflows)
+        else:
+            print("\nNo workflows registered")
+        return False
+    
+    def _cmd_display(self) -> bool:
+        """Display a workflow chosen by the user."""
+        workflow_name = self._prompt_workflow_choice()
+        if workflow_name is not None:
+            self.display_workflow(workflow_name)
+        return False
+    
+    def _cmd_visualize(self) -> bool:
+        """Visualize a workflow chosen by the user."""
+        workflow_name = self._prompt_workflow_choice()
+        if workflow_name is not None:
+            filename = self._read_input("Enter filename to save visualization (leave empty to display): ")
+            self.visualize_workflow(workflow_name, filename or None)
+        return False
+    
+    def _cmd_exit(self) -> bool:
+        """Leave the interactive loop."""
+        print("\nExiting AgenticFlow UI")
+        return True
+    
+    def _prompt_workflow_choice(self) -> Optional[str]:
+        """Ask the user to choose a workflow by number or name.
+        
+        Returns None, after telling the user why, if no valid workflow was chosen.
+        """
+        workflows = self.list_workflows()
+        if not workflows:
+            print("\nNo workflows registered")
+            return None
+        
+        self._print_workflows(workflows)
+        answer = self._read_input("\nEnter workflow number or name: ", workflows)
+        if answer in self.workflows:
+            return answer
+        
+        try:
+            idx = int(answer) - 1
+        except ValueError:
+            print("Invalid input")
+            return None
+        
+        if 0 <= idx < len(workflows):
+            return workflows[idx]
+        print("Invalid workflow number")
+        return None
+    
+    def _print_workflows(self, workflows: List[str]) -> None:
+        """Print a numbered list of workflow names."""
+        buf = io.StringIO()
+        buf.write("\nAvailable workflows:\n")
+        for i, name in enumerate(workflows, 1):
+            buf.write(f"  {i}. {name}\n")
+        sys.stdout.write(buf.getvalue())
+    
+    def _read_input(self, prompt: str, completions: Iterable[str] = ()) -> str:
+        """Read a line of input, tab-completing it from `completions` if readline is available."""
+        if readline is not None:
+            options = list(completions)
+            readline.set_completer(lambda text, state: ([o for o in options if o.startswith(text)] + [None])[state])
+        return input(prompt)
+    
+    def _load_history(self) -> None:
+        """Set up readline and load the input history of earlier sessions.
+        
+        The readline state replaced here is saved for `_restore_readline`, so an
+        interactive interpreter running the UI gets its own completer and history back.
+        """
+        if readline is None:
+            return
+        
+        self._saved_readline = (
+            readline.get_completer(),
+            readline.get_completer_delims(),
+            readline.get_history_length(),
+            [readline.get_history_item(i) for i in range(1, readline.get_current_history_length() + 1)],
+        )
+        
+        # Complete whole lines, since workflow names may contain spaces; readline cannot
+        # report key bindings, so tab stays bound to completion afterwards
+        readline.set_completer_delims("")
+        readline.parse_and_bind("tab: complete")
+        
+        # Start from our own history, capped so the history file does not grow forever
+        readline.clear_history()
+        readline.set_history_length(HISTORY_LENGTH)
+        try:
+            readline.read_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+    
+    def _save_history(self) -> None:
+        """Save the input history for later sessions."""
+        if readline is None:
+            return
+        
+        try:
+            readline.write_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+    
+    def _restore_readline(self) -> None:
+        """Restore the readline state saved by `_load_history`."""
+        if readline is None or self._saved_readline is None:
+            return
+        
+        completer, delims, history_length, history = self._saved_readline
+        readline.set_completer(completer)
+        readline.set_completer_delims(delims)
+        readline.set_history_length(history_length)
+        readline.clear_history()
+        for line in history:
+            readline.add_history(line)
+        self._saved_readline = None
+
+
+def save_visualization(workflow: Workflow, filename: str, cache_dir: str = VIZ_CACHE_DIR) -> bool:
+    """Save a visualization of a workflow, reusing an earlier render of the same graph.
+    
+    Renders are cached in `cache_dir`, keyed by a hash of the workflow name, contexts and
+    connections and of how it is drawn (the layout program and the render version).
+    Returns False if the visualization could not be rendered.
+    """
+    graph_repr = repr((
+        _RENDER_VERSION,
+        _layout_program(),
+        workflow.name,
+        sorted((ctx_id, context.name) for ctx_id, context in workflow.contexts.items()),
+        sorted(workflow.graph.edges(data='condition'), key=lambda edge: edge[:2]),
+    ))
+    key = hashlib.blake2b(graph_repr.encode(), digest_size=16).hexdigest()
+    cached_path = os.path.join(cache_dir, key + (os.path.splitext(filename)[1] or ".png"))
+    
+    # Render into the cache on a miss
+    if not os.path.exists(cached_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        workflow.visualize(cached_path)
+        if not os.path.exists(cached_path):
+            return False
+    
+    shutil.copyfile(cached_path, filename)
+    return True
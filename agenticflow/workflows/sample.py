@@ -1,12 +1,77 @@
 """Sample workflow for AgenticFlow framework."""
 
+from functools import lru_cache
 from ..core.workflow import Workflow
 from ..core.context import Context
 from ..tools.base import get_tool
 
 
-def create_sample_workflow() -> Workflow:
-    """Create a sample workflow for demonstration purposes."""
+# Outputs of the run functions below that do not depend on their inputs, built once
+_INPUT_OUT = {"user_input": "How does AgenticFlow compare to LangChain?"}
+
+_PROCESSED_OUT = {"processed_input": "Comparison between AgenticFlow and LangChain frameworks"}
+
+_SEARCH_OUT = {"search_results": """
+        AgenticFlow is a strategic AI agent framework that focuses on workflow execution using symbolic and learned planning techniques.
+        LangChain is a framework for developing applications powered by language models, focusing on composability and integration.
+        
+        Key differences:
+        1. AgenticFlow emphasizes strategic planning and decision-making
+        2. LangChain focuses on chaining together different components for LLM applications
+        3. AgenticFlow includes trainable strategy models
+        4. LangChain has a larger ecosystem of integrations
+        """}
+
+_GENERATED_OUT = {"generated_response": """
+        Based on your question about how AgenticFlow compares to LangChain:
+        
+        AgenticFlow is a strategic AI agent framework that focuses on workflow execution with an emphasis on planning techniques like DFS, BFS, and MCTS. It treats each step as an OOP-like object with defined inputs, prompts, tools, and outputs.
+        
+        LangChain, on the other hand, is a more general framework for LLM applications with a focus on composability and integrations.
+        
+        The key advantage of AgenticFlow is its emphasis on strategic planning and trainable strategy models, while LangChain offers a broader ecosystem of integrations and tools.
+        """}
+
+
+# Run functions for each context, defined once at import time
+def _run_input(context, inputs):
+    # In a real application, this would collect input from the user
+    return _INPUT_OUT
+
+
+def _run_process(context, inputs):
+    # In a real application, this would use an LLM to process inputs["user_input"]
+    return _PROCESSED_OUT
+
+
+def _run_search(context, inputs):
+    # In a real application, this would use a search tool on inputs["processed_input"]
+    return _SEARCH_OUT
+
+
+def _run_generate(context, inputs):
+    # In a real application, this would use an LLM to generate the response
+    # from the user input, processed input and search results
+    return _GENERATED_OUT
+
+
+def _run_output(context, inputs):
+    # Format the output
+    generated_response = inputs.get("generated_response", "")
+    
+    # In a real application, this might format the response in a specific way
+    return {"formatted_response": generated_response.strip()}
+
+
+@lru_cache(maxsize=1)
+def create_sample_workflow(memoize: bool = False) -> Workflow:
+    """Create a sample workflow for demonstration purposes.
+    
+    With `memoize=True`, the results of the process, search, generate and output
+    steps are persisted across runs, while the input step, which collects the user's
+    question, is always run. The workflow is built once and shared by later calls
+    with the same arguments.
+    """
     # Create a new workflow
     workflow = Workflow(
         name="Sample Workflow",
@@ -49,68 +114,12 @@ def create_sample_workflow() -> Workflow:
         prompt_template="Format the following response for the user:\n\n{generated_response}"
     )
     
-    # Define run functions for each context
-    def run_input(context):
-        # In a real application, this would collect input from the user
-        return {"user_input": "How does AgenticFlow compare to LangChain?"}
-    
-    def run_process(context):
-        # Process the user input
-        user_input = context.inputs.get("user_input", "")
-        # In a real application, this would use an LLM to process the input
-        processed_input = f"Comparison between AgenticFlow and LangChain frameworks"
-        return {"processed_input": processed_input}
-    
-    def run_search(context):
-        # Search for information
-        processed_input = context.inputs.get("processed_input", "")
-        # In a real application, this would use a search tool
-        search_results = """
-        AgenticFlow is a strategic AI agent framework that focuses on workflow execution using symbolic and learned planning techniques.
-        LangChain is a framework for developing applications powered by language models, focusing on composability and integration.
-        
-        Key differences:
-        1. AgenticFlow emphasizes strategic planning and decision-making
-        2. LangChain focuses on chaining together different components for LLM applications
-        3. AgenticFlow includes trainable strategy models
-        4. LangChain has a larger ecosystem of integrations
-        """
-        return {"search_results": search_results}
-    
-    def run_generate(context):
-        # Generate a response
-        user_input = context.inputs.get("user_input", "")
-        processed_input = context.inputs.get("processed_input", "")
-        search_results = context.inputs.get("search_results", "")
-        
-        # In a real application, this would use an LLM to generate the response
-        generated_response = f"""
-        Based on your question about how AgenticFlow compares to LangChain:
-        
-        AgenticFlow is a strategic AI agent framework that focuses on workflow execution with an emphasis on planning techniques like DFS, BFS, and MCTS. It treats each step as an OOP-like object with defined inputs, prompts, tools, and outputs.
-        
-        LangChain, on the other hand, is a more general framework for LLM applications with a focus on composability and integrations.
-        
-        The key advantage of AgenticFlow is its emphasis on strategic planning and trainable strategy models, while LangChain offers a broader ecosystem of integrations and tools.
-        """
-        
-        return {"generated_response": generated_response}
-    
-    def run_output(context):
-        # Format the output
-        generated_response = context.inputs.get("generated_response", "")
-        
-        # In a real application, this might format the response in a specific way
-        formatted_response = generated_response.strip()
-        
-        return {"formatted_response": formatted_response}
-    
     # Set run functions for each context
-    input_context.set_run_function(run_input)
-    process_context.set_run_function(run_process)
-    search_context.set_run_function(run_search)
-    generate_context.set_run_function(run_generate)
-    output_context.set_run_function(run_output)
+    input_context.set_run_function(_run_input)
+    process_context.set_run_function(_run_process)
+    search_context.set_run_function(_run_search)
+    generate_context.set_run_function(_run_generate)
+    output_context.set_run_function(_run_output)
     
     # Add contexts to workflow
     workflow.add_context(input_context)
@@ -125,4 +134,8 @@ def create_sample_workflow() -> Workflow:
     workflow.connect("search", "generate")
     workflow.connect("generate", "output")
     
+    # Skip unchanged steps on later runs
+    if memoize:
+        workflow.set_memoization(context_ids=["process", "search", "generate", "output"])
+    
     return workflow
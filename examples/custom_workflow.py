@@ -2,16 +2,95 @@
 
 import os
 import sys
+from functools import lru_cache
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agenticflow.core.workflow import Workflow
 from agenticflow.core.context import Context
 from agenticflow.core.action_model import ActionModel
 from agenticflow.strategies.registry import default_registry
+from agenticflow.ui.simple_ui import save_visualization
 
 
-def create_custom_workflow() -> Workflow:
-    """Create a custom workflow for text analysis."""
+# Outputs of the run functions below that do not depend on their inputs, built once
+
+# For this example, we'll use a hardcoded text input
+_TEXT_INPUT_OUT = {"text_input": """
+        AgenticFlow is a strategic AI agent framework capable of executing complex workflows 
+        using both symbolic and learned planning techniques. It enables the development of 
+        flexible, extensible, and trainable agent-based applications with robust planning 
+        and reasoning capabilities.
+        """}
+
+_SENTIMENT_OUT = {
+    "sentiment": "Positive - The text describes a framework with positive attributes like 'flexible', 'extensible', and 'robust'"
+}
+
+_ENTITIES_OUT = {
+    "entities": [
+        {"type": "FRAMEWORK", "text": "AgenticFlow"},
+        {"type": "CONCEPT", "text": "strategic AI agent framework"},
+        {"type": "CAPABILITY", "text": "symbolic and learned planning techniques"},
+        {"type": "ATTRIBUTE", "text": "flexible"},
+        {"type": "ATTRIBUTE", "text": "extensible"},
+        {"type": "ATTRIBUTE", "text": "trainable"},
+    ]
+}
+
+_SUMMARY_OUT = {
+    "summary": "AgenticFlow is an AI framework for creating flexible and trainable agent-based applications with advanced planning capabilities."
+}
+
+_INSIGHTS_OUT = {"insights": """
+        Key Insights:
+        1. AgenticFlow positions itself as a strategic framework, emphasizing planning capabilities
+        2. The framework focuses on flexibility and extensibility, suggesting it's designed for diverse applications
+        3. The mention of "trainable" indicates machine learning capabilities
+        4. The framework appears to combine symbolic AI with machine learning approaches
+        
+        Potential Applications:
+        - Complex decision-making systems requiring strategic planning
+        - Workflow automation with adaptive learning capabilities
+        - Multi-agent systems with sophisticated coordination requirements
+        """}
+
+
+# Run functions for each context, defined once at import time
+def _run_text_input(context, inputs):
+    # In a real application, this could come from user input or a file
+    return _TEXT_INPUT_OUT
+
+
+# The three analyses only depend on the text input; they are coroutines so strategies
+# running concurrently can overlap them once they make real API calls
+async def _run_sentiment_analysis(context, inputs):
+    # In a real application, this would use an NLP model or API on inputs["text_input"]
+    return _SENTIMENT_OUT
+
+
+async def _run_entity_extraction(context, inputs):
+    # In a real application, this would use an NLP model or API on inputs["text_input"]
+    return _ENTITIES_OUT
+
+
+async def _run_summary(context, inputs):
+    # In a real application, this would use an NLP model or API on inputs["text_input"]
+    return _SUMMARY_OUT
+
+
+def _run_insights(context, inputs):
+    # Generate insights based on all analyses
+    return _INSIGHTS_OUT
+
+
+@lru_cache(maxsize=1)
+def create_custom_workflow(memoize: bool = False) -> Workflow:
+    """Create a custom workflow for text analysis.
+    
+    With `memoize=True`, the results of the analysis steps are persisted across runs;
+    the input step is always run, since its input may change. The workflow is built
+    once and shared by later calls with the same arguments.
+    """
     # Create a new workflow
     workflow = Workflow(
         name="Text Analysis Workflow",
@@ -54,71 +133,12 @@ def create_custom_workflow() -> Workflow:
         prompt_template="Generate insights based on the following analyses:\n\nText: {text_input}\nSentiment: {sentiment}\nEntities: {entities}\nSummary: {summary}"
     )
     
-    # Define run functions for each context
-    def run_text_input(context):
-        # For this example, we'll use a hardcoded text input
-        # In a real application, this could come from user input or a file
-        text = """
-        AgenticFlow is a strategic AI agent framework capable of executing complex workflows 
-        using both symbolic and learned planning techniques. It enables the development of 
-        flexible, extensible, and trainable agent-based applications with robust planning 
-        and reasoning capabilities.
-        """
-        return {"text_input": text}
-    
-    def run_sentiment_analysis(context):
-        text = context.inputs.get("text_input", "")
-        # In a real application, this would use an NLP model or API
-        sentiment = "Positive - The text describes a framework with positive attributes like 'flexible', 'extensible', and 'robust'"
-        return {"sentiment": sentiment}
-    
-    def run_entity_extraction(context):
-        text = context.inputs.get("text_input", "")
-        # In a real application, this would use an NLP model or API
-        entities = [
-            {"type": "FRAMEWORK", "text": "AgenticFlow"},
-            {"type": "CONCEPT", "text": "strategic AI agent framework"},
-            {"type": "CAPABILITY", "text": "symbolic and learned planning techniques"},
-            {"type": "ATTRIBUTE", "text": "flexible"},
-            {"type": "ATTRIBUTE", "text": "extensible"},
-            {"type": "ATTRIBUTE", "text": "trainable"},
-        ]
-        return {"entities": entities}
-    
-    def run_summary(context):
-        text = context.inputs.get("text_input", "")
-        # In a real application, this would use an NLP model or API
-        summary = "AgenticFlow is an AI framework for creating flexible and trainable agent-based applications with advanced planning capabilities."
-        return {"summary": summary}
-    
-    def run_insights(context):
-        text = context.inputs.get("text_input", "")
-        sentiment = context.inputs.get("sentiment", "")
-        entities = context.inputs.get("entities", [])
-        summary = context.inputs.get("summary", "")
-        
-        # Generate insights based on all analyses
-        insights = """
-        Key Insights:
-        1. AgenticFlow positions itself as a strategic framework, emphasizing planning capabilities
-        2. The framework focuses on flexibility and extensibility, suggesting it's designed for diverse applications
-        3. The mention of "trainable" indicates machine learning capabilities
-        4. The framework appears to combine symbolic AI with machine learning approaches
-        
-        Potential Applications:
-        - Complex decision-making systems requiring strategic planning
-        - Workflow automation with adaptive learning capabilities
-        - Multi-agent systems with sophisticated coordination requirements
-        """
-        
-        return {"insights": insights}
-    
     # Set run functions for each context
-    text_input_context.set_run_function(run_text_input)
-    sentiment_analysis_context.set_run_function(run_sentiment_analysis)
-    entity_extraction_context.set_run_function(run_entity_extraction)
-    summary_context.set_run_function(run_summary)
-    insights_context.set_run_function(run_insights)
+    text_input_context.set_run_function(_run_text_input)
+    sentiment_analysis_context.set_run_function(_run_sentiment_analysis)
+    entity_extraction_context.set_run_function(_run_entity_extraction)
+    summary_context.set_run_function(_run_summary)
+    insights_context.set_run_function(_run_insights)
     
     # Add contexts to workflow
     workflow.add_context(text_input_context)
@@ -135,25 +155,29 @@ def create_custom_workflow() -> Workflow:
     workflow.connect("entity_extraction", "insights")
     workflow.connect("summary", "insights")
     
+    # Skip unchanged steps on later runs
+    if memoize:
+        workflow.set_memoization(context_ids=["sentiment_analysis", "entity_extraction", "summary", "insights"])
+    
     return workflow
 
 
-def run_workflow(strategy="dfs"):
-    """Run the custom workflow with the specified strategy."""
+def run_workflow(strategy="dfs", **options):
+    """Run the custom workflow with the specified strategy.
+    
+    Extra keyword options are passed on to the strategy. Returns the result together
+    with the workflow that was run.
+    """
     print(f"Running custom workflow with {strategy} strategy...\n")
     
     # Create the workflow
     workflow = create_custom_workflow()
     
-    # Create an action model
-    action_model = ActionModel()
-    
-    # Register strategies
-    for name, strategy_func in default_registry.strategies.items():
-        action_model.register_strategy(name, strategy_func)
+    # Create an action model with the default strategies
+    action_model = ActionModel(default_registry)
     
     # Execute the workflow
-    result = action_model.execute(workflow, strategy=strategy)
+    result = action_model.execute(workflow, strategy=strategy, **options)
     
     # Print the result
     print("\nWorkflow execution complete!\n")
@@ -167,21 +191,25 @@ def run_workflow(strategy="dfs"):
     print("\nInsights:")
     print(result.get('insights', 'No insights generated'))
     
-    return result
+    return result, workflow
 
 
 if __name__ == "__main__":
     # Create directory if it doesn't exist
     os.makedirs(os.path.dirname(os.path.abspath(__file__)), exist_ok=True)
     
-    # Default to DFS, but you can change this to 'bfs' or 'mcts'
-    run_workflow("dfs")
+    # Run the three analyses concurrently once the text input is ready; you can also
+    # use 'dfs', 'bfs' or 'mcts'
+    result, workflow = run_workflow("topo", concurrent=True)
     
-    # Visualize the workflow (requires matplotlib)
+    # Visualize the workflow that was just run (requires matplotlib), reusing an earlier
+    # render if the graph is unchanged
     try:
-        import matplotlib.pyplot as plt
-        workflow = create_custom_workflow()
-        workflow.visualize("text_analysis_workflow.png")
-        print("\nWorkflow visualization saved to text_analysis_workflow.png")
+        import matplotlib
     except ImportError:
         print("\nMatplotlib is required for visualization")
+    else:
+        # Only saving to a file here, so skip loading an interactive backend
+        matplotlib.use("Agg")
+        if save_visualization(workflow, "text_analysis_workflow.png"):
+            print("\nWorkflow visualization saved to text_analysis_workflow.png")
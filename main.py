@@ -4,7 +4,6 @@ import os
 import argparse
 from agenticflow.core.action_model import ActionModel
 from agenticflow.strategies.registry import default_registry
-from agenticflow.workflows.sample import create_sample_workflow
 from agenticflow.ui.simple_ui import SimpleUI
 
 
@@ -12,15 +11,12 @@ def run_sample_workflow(strategy="dfs"):
     """Run the sample workflow with the specified strategy."""
     print(f"Running sample workflow with {strategy} strategy...")
     
-    # Create the sample workflow
+    # Create the sample workflow, importing it only when it is needed
+    from agenticflow.workflows.sample import create_sample_workflow
     workflow = create_sample_workflow()
     
-    # Create an action model
-    action_model = ActionModel()
-    
-    # Register strategies
-    for name, strategy_func in default_registry.strategies.items():
-        action_model.register_strategy(name, strategy_func)
+    # Create an action model with the default strategies
+    action_model = ActionModel(default_registry)
     
     # Execute the workflow
     result = action_model.execute(workflow, strategy=strategy)
@@ -40,6 +36,7 @@ def run_interactive_ui():
     ui = SimpleUI()
     
     # Register the sample workflow
+    from agenticflow.workflows.sample import create_sample_workflow
     workflow = create_sample_workflow()
     ui.register_workflow(workflow)
     
@@ -51,7 +48,7 @@ def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="AgenticFlow Demo")
     parser.add_argument("--ui", action="store_true", help="Run the interactive UI")
-    parser.add_argument("--strategy", type=str, default="dfs", choices=["dfs", "bfs", "mcts"],
+    parser.add_argument("--strategy", type=str, default="dfs", choices=["dfs", "bfs", "mcts", "topo"],
                        help="Strategy to use for workflow execution")
     args = parser.parse_args()
     
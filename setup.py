@@ -9,12 +9,14 @@ setup(
     author="AgenticFlow Team",
     packages=find_packages(),
     install_requires=[
-        "langchain",
-        "openai",
         "networkx",
-        "matplotlib",
-        "pydantic",
         "requests",
     ],
-    python_requires=">=3.8",
+    extras_require={
+        "viz": ["matplotlib"],
+        "llm": ["langchain", "openai"],
+        "jit": ["numba"],
+        "json": ["orjson"],
+    },
+    python_requires=">=3.10",
 )